@@ -1,20 +1,23 @@
+import functools
 import os
+
 from dotenv import load_dotenv
 from dify_plugin import Plugin, DifyPluginEnv
 
-# 加载环境变量
-load_dotenv()
-
-# 创建插件环境配置
-env_config = DifyPluginEnv(
-    MAX_REQUEST_TIMEOUT=120,
-    INSTALL_METHOD=os.getenv('INSTALL_METHOD', 'local'),
-    REMOTE_INSTALL_URL=os.getenv('REMOTE_INSTALL_URL'),
-    REMOTE_INSTALL_PORT=int(os.getenv('REMOTE_INSTALL_PORT', 5003)),
-    REMOTE_INSTALL_KEY=os.getenv('REMOTE_INSTALL_KEY')
-)
+@functools.cache
+def _load_env() -> DifyPluginEnv:
+    """加载并校验环境配置，进程内只解析一次；配置非法时在启动阶段即失败"""
+    load_dotenv()
+    env = os.environ
+    return DifyPluginEnv(
+        MAX_REQUEST_TIMEOUT=120,
+        INSTALL_METHOD=env.get('INSTALL_METHOD', 'local'),
+        REMOTE_INSTALL_URL=env.get('REMOTE_INSTALL_URL'),
+        REMOTE_INSTALL_PORT=int(env.get('REMOTE_INSTALL_PORT', 5003)),
+        REMOTE_INSTALL_KEY=env.get('REMOTE_INSTALL_KEY')
+    )
 
-plugin = Plugin(env_config)
+plugin = Plugin(_load_env())
 
 if __name__ == '__main__':
     plugin.run()
@@ -5,11 +5,32 @@
 用于验证API调用是否正常工作
 """
 
+import orjson
 import requests
 import urllib.parse
-import json
 import sys
 
+# 详细输出开关 - 运行时加 --verbose 才打印完整JSON响应
+VERBOSE = "--verbose" in sys.argv
+from urllib3.util.retry import Retry
+
+# 模块级共享Session - 连接池+keep-alive，避免每次调用重新建立TCP/TLS连接
+# Retry: 对429/5xx做指数退避重试（尊重Retry-After头）
+# raise_on_status=False: 重试耗尽后返回最后的响应，保留按状态码的错误提示
+_SESSION = requests.Session()
+_retry = Retry(
+    total=3,
+    backoff_factor=1.0,
+    status_forcelist=[429, 502, 503, 504],
+    allowed_methods=["POST"],
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+_adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_retry)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers.update({"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"})
+
 def test_5118_api(apikey, keywords, adverb=""):
     """
     测试5118 API调用
@@ -23,14 +44,8 @@ def test_5118_api(apikey, keywords, adverb=""):
         dict: API响应结果
     """
     try:
-        url = "http://apis.5118.com/ai/seometa"
-        
-        # 构建请求头
-        headers = {
-            "Authorization": apikey,
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
-        }
-        
+        url = "https://apis.5118.com/ai/seometa"
+
         # 构建请求数据
         data_params = {"keywords": keywords}
         if adverb:
@@ -48,22 +63,23 @@ def test_5118_api(apikey, keywords, adverb=""):
         
         # 发送POST请求
         print("📡 发送API请求...")
-        response = requests.post(
-            url, 
-            headers=headers, 
+        response = _SESSION.post(
+            url,
+            headers={"Authorization": apikey},
             data=data,
-            timeout=30,
-            verify=True
+            # (连接, 读取)分离超时：连不上的主机~3s就失败
+            timeout=(3.05, 27)
         )
         
         print(f"📊 响应状态码: {response.status_code}")
-        print(f"📊 响应头: {dict(response.headers)}")
+        print(f"📊 响应头: {response.headers}")
         
         # 处理HTTP状态码
         if response.status_code == 200:
             try:
-                result_data = response.json()
-                print(f"📊 JSON响应: {json.dumps(result_data, ensure_ascii=False, indent=2)}")
+                result_data = orjson.loads(response.content)
+                if VERBOSE:
+                    print(f"📊 JSON响应: {orjson.dumps(result_data, option=orjson.OPT_INDENT_2).decode()}")
                 
                 # 根据5118 API文档检查返回格式
                 if 'errcode' in result_data:
@@ -89,7 +105,7 @@ def test_5118_api(apikey, keywords, adverb=""):
                         "data": result_data,
                     }
                     
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # 如果返回的不是JSON，直接返回文本
                 print(f"⚠️ 响应不是JSON格式: {response.text}")
                 return {
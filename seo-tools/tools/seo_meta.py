@@ -1,230 +1,341 @@
+import functools
+import hashlib
+import orjson
+import os
+import re
 import requests
-import json
+import socket
+import sys
+import threading
+import time
 import urllib.parse
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections.abc import Generator
 from typing import Any
 import logging
-from dify_plugin.config.logger_format import plugin_logger_handler
 
 from dify_plugin import Tool
 from dify_plugin.entities.tool import ToolInvokeMessage
 
-# 使用自定义处理器设置日志
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
-logger.addHandler(plugin_logger_handler)
+
+# 调试开关 - 进度类消息每条都要过一次插件IPC边界，生产环境默认只输出最终结果
+_DEBUG = os.getenv("SEO_TOOLS_DEBUG") == "1"
+
+# 预编译的参数校验正则 - 长度校验在C层一次完成
+_KEYWORDS_RE = re.compile(r".{1,100}", re.DOTALL)
+_APIKEY_RE = re.compile(r".{10,}", re.DOTALL)
+
+def _clean(s: str) -> str:
+    """去除首尾空白；本就无空白的字符串（常见情况）原样返回，不产生新对象"""
+    return s if s and not (s[0].isspace() or s[-1].isspace()) else s.strip()
+
+@functools.cache
+def _setup_logger() -> None:
+    """首次调用时才挂载自定义日志处理器，降低模块导入的冷启动开销"""
+    from dify_plugin.config.logger_format import plugin_logger_handler
+    logger.addHandler(plugin_logger_handler)
+
+# 模块级共享Session - 连接池+keep-alive，避免每次调用重新建立TCP/TLS连接
+# pool_maxsize=50 允许运行时的多个并发调用复用同一个连接池而不互相阻塞
+# Retry: 对429/5xx做指数退避重试（尊重Retry-After头），平滑瞬时限流和抖动
+# raise_on_status=False: 重试耗尽后返回最后的响应而不是抛RetryError，
+# 让下面按状态码定制的错误提示分支仍然生效
+_SESSION = requests.Session()
+_retry = Retry(
+    total=3,
+    backoff_factor=1.0,
+    status_forcelist=[429, 502, 503, 504],
+    allowed_methods=["POST"],
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+_adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=_retry)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+_SESSION.headers.update({
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    # 响应体很小，gzip解压的CPU开销大于带宽收益，直接要未压缩的
+    "Accept-Encoding": "identity",
+})
+
+def _warmup_session() -> None:
+    """预热DNS和TLS：运行时加载本模块时就在共享Session的连接池里建好到5118的连接，
+    首次工具调用不用付全额首连延迟；预热只是优化，失败不影响工具可用"""
+    try:
+        socket.gethostbyname("apis.5118.com")
+        _SESSION.head("https://apis.5118.com/", timeout=5)
+    except Exception:
+        pass
+
+_warmup_session()
+
+# 进程内结果缓存 - 相同(密钥, 关键词, 副词)的重复查询1小时内直接命中，
+# 省去一次完整RTT且不消耗5118配额；失败的响应不缓存
+_CACHE_MAXSIZE = 1024
+_CACHE_TTL = 3600  # 秒
+_CACHE: OrderedDict = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+def _cache_key(apikey: str, keywords: str, adverb: str) -> tuple:
+    # 缓存键里只保留密钥的blake2b摘要，避免明文secret驻留内存
+    apikey_hash = hashlib.blake2b(apikey.encode(), digest_size=16).hexdigest()
+    return (apikey_hash, keywords, adverb)
+
+def _cache_get(key: tuple):
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del _CACHE[key]
+            return None
+        _CACHE.move_to_end(key)
+        return result
+
+def _cache_put(key: tuple, result: dict) -> None:
+    with _CACHE_LOCK:
+        _CACHE[key] = (time.monotonic() + _CACHE_TTL, result)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _CACHE_MAXSIZE:
+            _CACHE.popitem(last=False)
+
+# _format_seo_result 的分支格式化函数 - 模块级纯函数，按errcode字典分发，
+# 避免嵌套if/else和每次调用的列表分配
+_FMT_HEADER = sys.intern(f"🎯 5118 SEO元数据生成结果\n{'=' * 40}\n")
+_FMT_FOOTER = sys.intern("\n✅ SEO元数据生成完成！")
+_FMT_RAW_HEADER = sys.intern("📊 5118 SEO元数据生成结果：\n\n")
+
+def _fmt_success(result_data: dict) -> str:
+    return f"{_FMT_HEADER}\n📝 SEO元数据:\n   {result_data['data']}\n{_FMT_FOOTER}"
+
+def _fmt_error(result_data: dict) -> str:
+    return (
+        f"{_FMT_HEADER}\n❌ API错误:\n"
+        f"   错误代码: {result_data['errcode']}\n"
+        f"   错误信息: {result_data.get('errmsg', '未知错误')}\n{_FMT_FOOTER}"
+    )
+
+def _fmt_generic(result_data: dict) -> str:
+    fields = "\n".join(
+        f"📌 {key}:\n   {value}\n" for key, value in result_data.items() if value
+    )
+    return f"{_FMT_HEADER}\n{fields}{_FMT_FOOTER}"
+
+_FMT_DISPATCH = {"0": _fmt_success}
 
 class SeoMetaTool(Tool):
     """5118 SEO元数据生成工具"""
-    
+
+    # 本类不增加实例属性，空__slots__省掉每个实例的__dict__
+    __slots__ = ()
+
     def _invoke(self, tool_parameters: dict[str, Any]) -> Generator[ToolInvokeMessage]:
         """
         调用5118 API生成SEO元数据
-        
+
         Args:
             tool_parameters: 工具参数
-            
+
         Yields:
             ToolInvokeMessage: 工具调用结果
         """
-        # 立即输出确认信息
-        yield self.create_text_message(text="🚀 插件开始执行...")
-        
-        # 输出参数信息
-        param_info = f"📋 参数信息：\n{tool_parameters}\n"
-        yield self.create_text_message(text=param_info)
-        
+        _setup_logger()
+
+        # 调试模式下输出确认信息和参数信息
+        if _DEBUG:
+            yield self.create_text_message(text="🚀 插件开始执行...")
+            param_info = f"📋 参数信息：\n{tool_parameters}\n"
+            yield self.create_text_message(text=param_info)
+
         # 记录日志
         logger.info("=== 开始执行SEO工具 ===")
         logger.info(f"工具参数: {tool_parameters}")
-        
+
         try:
             # 获取参数
-            keywords = tool_parameters.get('keywords', '').strip()
-            adverb = tool_parameters.get('adverb', '').strip()
-            
+            keywords = _clean(tool_parameters.get('keywords', ''))
+            adverb = _clean(tool_parameters.get('adverb', ''))
+
             # 从凭据中获取API密钥
             credentials = self.runtime.credentials
-            apikey = credentials.get('apikey', '').strip()
-            
+            apikey = _clean(credentials.get('apikey', ''))
+
             # 输出参数状态
-            param_status = f"📋 参数状态：\n- keywords: {keywords}\n- adverb: {adverb}\n- apikey: {'已设置' if apikey else '未设置'}\n"
-            yield self.create_text_message(text=param_status)
-            
-            # 如果没有必要参数，直接返回
-            if not keywords or not apikey:
-                yield self.create_text_message(text="❌ 错误：缺少必要参数（关键词或API密钥）")
+            if _DEBUG:
+                param_status = f"📋 参数状态：\n- keywords: {keywords}\n- adverb: {adverb}\n- apikey: {'已设置' if apikey else '未设置'}\n"
+                yield self.create_text_message(text=param_status)
+
+            # 校验参数，不合法直接返回
+            validation_error = self._validate_parameters(keywords, apikey)
+            if validation_error:
+                yield self.create_text_message(text=validation_error)
                 return
-            
+
             # 开始API调用
-            yield self.create_text_message(text="📡 开始调用5118 API...")
-            
+            if _DEBUG:
+                yield self.create_text_message(text="📡 开始调用5118 API...")
+
+            # 多个关键词（逗号分隔）时并发请求，整体耗时由sum(latency)降为max(latency)
+            keyword_list = [k.strip() for k in keywords.split(',') if k.strip()]
+            if len(keyword_list) > 1:
+                with ThreadPoolExecutor(max_workers=min(8, len(keyword_list))) as executor:
+                    futures = {
+                        executor.submit(self._call_5118_api, kw, adverb, apikey): kw
+                        for kw in keyword_list
+                    }
+                    # 哪个先完成就先输出哪个
+                    for future in as_completed(futures):
+                        kw = futures[future]
+                        api_response = future.result()
+                        if api_response['success']:
+                            formatted_result = self._format_seo_result(api_response['data'])
+                            yield self.create_text_message(text=f"🔑 关键词「{kw}」:\n{formatted_result}")
+                        else:
+                            yield self.create_text_message(text=f"🔑 关键词「{kw}」:\n{api_response['error']}")
+                return
+
             # 构建并发送API请求
             api_response = self._call_5118_api(keywords, adverb, apikey)
-            
+
             # 处理API响应
             if api_response['success']:
                 formatted_result = self._format_seo_result(api_response['data'])
                 yield self.create_text_message(text=formatted_result)
             else:
                 yield self.create_text_message(text=api_response['error'])
-                
+
         except Exception as e:
             error_msg = f"🚨 插件执行错误: {str(e)}"
             yield self.create_text_message(text=error_msg)
-    
+
     def _validate_parameters(self, keywords: str, apikey: str) -> str:
         """验证输入参数"""
-        if not keywords:
-            return "❌ 错误：主关键词不能为空，请输入要优化的关键词"
-        
-        if len(keywords) > 100:
+        if not _KEYWORDS_RE.fullmatch(keywords):
+            if not keywords:
+                return "❌ 错误：主关键词不能为空，请输入要优化的关键词"
             return "❌ 错误：主关键词长度不能超过100个字符"
-        
-        if not apikey:
-            return "❌ 错误：API密钥不能为空，请在5118.com获取API密钥"
-        
-        if len(apikey) < 10:
+
+        if not _APIKEY_RE.fullmatch(apikey):
+            if not apikey:
+                return "❌ 错误：API密钥不能为空，请在5118.com获取API密钥"
             return "❌ 错误：API密钥格式不正确，请检查密钥是否完整"
-        
+
         return None
-    
+
     def _call_5118_api(self, keywords: str, adverb: str, apikey: str) -> dict[str, Any]:
-        """调用5118 API"""
+        """调用5118 API（带进程内TTL缓存）"""
+        key = _cache_key(apikey, keywords, adverb)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        result = self._request_5118_api(keywords, adverb, apikey)
+        if result.get('success'):
+            _cache_put(key, result)
+        return result
+
+    def _request_5118_api(self, keywords: str, adverb: str, apikey: str) -> dict[str, Any]:
+        """发送5118 API请求"""
         try:
-            url = "http://apis.5118.com/ai/seometa"
-            
-            # 构建请求头 - 与PHP示例保持一致
-            headers = {
-                "Authorization": apikey,
-                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
-            }
-            
-            # 构建请求数据 - 与PHP示例保持一致
-            data_params = {"keywords": keywords}
+            url = "https://apis.5118.com/ai/seometa"
+
+            # 构建请求数据 - 直接用quote_plus拼接表单体，省掉dict→urlencode的中间开销
+            data = f"keywords={urllib.parse.quote_plus(keywords)}"
             if adverb:
-                data_params["adverb"] = adverb
-            
-            # URL编码数据 - 与PHP示例保持一致
-            data = urllib.parse.urlencode(data_params, encoding='utf-8')
-            
-            # 发送POST请求
-            response = requests.post(
-                url, 
-                headers=headers, 
-                data=data,  # 直接传递编码后的字符串
-                timeout=30,
-                verify=True
+                data += f"&adverb={urllib.parse.quote_plus(adverb)}"
+
+            # 发送POST请求 - 复用共享Session的连接池；传bytes避免requests内部再编码一次
+            response = _SESSION.post(
+                url,
+                headers={"Authorization": apikey},
+                data=data.encode('utf-8'),
+                # (连接, 读取)分离超时：连不上的主机~3s就失败，重试退避能更早介入
+                timeout=(3.05, 27)
             )
-            
+
             # 处理HTTP状态码
             if response.status_code == 200:
                 try:
-                    result_data = response.json()
-                    
+                    # orjson直接解析原始bytes，比stdlib json快数倍
+                    result_data = orjson.loads(response.content)
+
                     # 根据5118 API文档检查返回格式
                     if 'errcode' in result_data:
                         if result_data['errcode'] == "0":
                             # 成功
                             return {
-                                "success": True, 
+                                "success": True,
                                 "data": result_data,
                             }
                         else:
                             # API返回错误
                             error_msg = result_data.get('errmsg', '未知错误')
                             return {
-                                "success": False, 
+                                "success": False,
                                 "error": f"❌ API错误: {error_msg}",
                             }
                     else:
                         # 没有errcode字段，可能是其他格式
                         return {
-                            "success": True, 
+                            "success": True,
                             "data": result_data,
                         }
-                        
-                except json.JSONDecodeError:
+
+                except orjson.JSONDecodeError:
                     # 如果返回的不是JSON，直接返回文本
+                    # 5118固定返回UTF-8，直接解码bytes，跳过response.text的编码探测
                     return {
-                        "success": True, 
-                        "data": {"raw_response": response.text},
+                        "success": True,
+                        "data": {"raw_response": response.content.decode('utf-8', errors='replace')},
                     }
-                    
+
             elif response.status_code == 401:
                 return {
-                    "success": False, 
+                    "success": False,
                     "error": "❌ API密钥无效或已过期，请检查密钥是否正确",
                 }
             elif response.status_code == 403:
                 return {
-                    "success": False, 
+                    "success": False,
                     "error": "❌ API密钥权限不足，请检查账户余额或权限设置",
                 }
             elif response.status_code == 429:
                 return {
-                    "success": False, 
+                    "success": False,
                     "error": "❌ API调用频率超限，请稍后再试",
                 }
             else:
                 return {
-                    "success": False, 
-                    "error": f"❌ API调用失败，状态码: {response.status_code}\n响应: {response.text[:200]}",
+                    "success": False,
+                    "error": f"❌ API调用失败，状态码: {response.status_code}\n"
+                             f"响应: {response.content.decode('utf-8', errors='replace')[:200]}",
                 }
-                
+
         except requests.exceptions.Timeout:
             return {"success": False, "error": "❌ API请求超时，请检查网络连接或稍后重试"}
         except requests.exceptions.ConnectionError:
             return {"success": False, "error": "❌ 网络连接错误，请检查网络设置"}
         except requests.exceptions.RequestException as e:
             return {"success": False, "error": f"❌ 网络请求错误: {str(e)}"}
-    
+
     def _format_seo_result(self, result_data: dict[str, Any]) -> str:
         """格式化SEO结果输出"""
         if not result_data:
             return "❌ API返回数据为空"
-        
-        # 如果是原始响应
-        if 'raw_response' in result_data:
-            return f"📊 5118 SEO元数据生成结果：\n\n{result_data['raw_response']}"
-        
-        # 格式化JSON响应
-        formatted_output = ["🎯 5118 SEO元数据生成结果", "=" * 40, ""]
-        
-        # 根据5118 API的实际响应结构来格式化
+
+        # 常见路径优先：原始响应和5118标准格式（errcode+data）都在这里早退
         if isinstance(result_data, dict):
-            # 检查是否有errcode和data字段（5118 API标准格式）
+            raw = result_data.get('raw_response')
+            if raw is not None:
+                return _FMT_RAW_HEADER + raw
             if 'errcode' in result_data and 'data' in result_data:
-                if result_data['errcode'] == "0":
-                    # 成功，解析data字段
-                    data_content = result_data['data']
-                    formatted_output.extend([
-                        "📝 SEO元数据:",
-                        f"   {data_content}",
-                        ""
-                    ])
-                else:
-                    # 有错误
-                    error_msg = result_data.get('errmsg', '未知错误')
-                    formatted_output.extend([
-                        "❌ API错误:",
-                        f"   错误代码: {result_data['errcode']}",
-                        f"   错误信息: {error_msg}",
-                        ""
-                    ])
-            else:
-                # 其他格式，显示所有字段
-                for key, value in result_data.items():
-                    if value:
-                        formatted_output.extend([
-                            f"📌 {key}:",
-                            f"   {value}",
-                            ""
-                        ])
-        else:
-            # 如果不是字典格式，直接显示
-            formatted_output.append(str(result_data))
-        
-        formatted_output.extend(["", "✅ SEO元数据生成完成！"])
-        
-        return "\n".join(formatted_output)
\ No newline at end of file
+                return _FMT_DISPATCH.get(result_data['errcode'], _fmt_error)(result_data)
+            return _fmt_generic(result_data)
+
+        # 如果不是字典格式，直接显示
+        return f"{_FMT_HEADER}\n{result_data}{_FMT_FOOTER}"